@@ -5,23 +5,34 @@ Responsibility : Join news + market data, compute per-stock impact scores,
                  classify trends, and produce the final ranked output.
 
 Input  : data/news_processed.json   (sentiment, companies, summary …)
-         data/market_data.json       (ohlcv per ticker)
+         data/market_data.parquet    (ohlcv per ticker; .json fallback)
 Output : data/analysis_output.json  →  top bullish, top bearish, full list
 """
 
-import json
 import os
 from datetime import datetime
 
+import numpy as np
 import pandas as pd
 
 from core.config import (
     SENTIMENT_SCORE_MAP,
-    IMPACT_WEIGHTS,
     PROCESSED_NEWS_FILE,
     MARKET_FILE,
+    MARKET_PARQUET_FILE,
     ANALYSIS_FILE,
+    SCHEMA,
 )
+from core.jsonio import load_json, dump_json
+from core.scores import FORMULA_VERSIONS, impact_v1, trend
+
+# Column order of the per-(article, ticker) rows in "full_list"
+_ROW_COLUMNS = [
+    "symbol", "sentiment_label", "sentiment_num", "movement_score",
+    "volume", "volume_score", "impact_score", "trend",
+    "open", "close", "high", "low",
+    "news_headline", "matched_news", "summary", "keywords", "timestamp",
+]
 
 
 class AnalysisAgent:
@@ -32,27 +43,42 @@ class AnalysisAgent:
     @staticmethod
     def _load(path: str):
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f)
+            return load_json(path)
         except Exception as e:
             print(f"  ⚠️  Could not load {path}: {e}")
             return [] if path == PROCESSED_NEWS_FILE else {}
 
+    @staticmethod
+    def _load_market() -> pd.DataFrame:
+        """
+        Ticker-indexed market snapshot. The typed Parquet copy is read
+        straight into columns; the JSON dict is the fallback.
+        """
+        try:
+            return pd.read_parquet(MARKET_PARQUET_FILE).set_index("symbol")
+        except Exception:
+            market_data = AnalysisAgent._load(MARKET_FILE)
+            return pd.DataFrame.from_dict(market_data, orient="index")
+
     # ── Sentiment label → float ───────────────────────────────────────
     @staticmethod
-    def _sentiment_num(label: str) -> float:
-        return SENTIMENT_SCORE_MAP.get(label.strip().lower(), 0.0)
+    def _sentiment_num(labels: pd.Series) -> pd.Series:
+        # normalise each distinct label once, not once per (article, ticker)
+        lookup = {label: SENTIMENT_SCORE_MAP.get(str(label).strip().lower(), 0.0)
+                  for label in labels.unique()}
+        return labels.map(lookup)
 
     # ── Intraday movement score  (close - open) / open ───────────────
     @staticmethod
-    def _movement_score(entry: dict) -> float:
-        o = entry.get("open", 0)
-        c = entry.get("close", 0)
-        return round((c - o) / o, 4) if o != 0 else 0.0
+    def _movement_score(df: pd.DataFrame) -> np.ndarray:
+        o = df["open"].to_numpy(dtype=float)
+        c = df["close"].to_numpy(dtype=float)
+        safe = np.where(o != 0, o, 1.0)
+        return np.where(o != 0, (c - o) / safe, 0.0).round(4)
 
     # ── Volume normalisation ──────────────────────────────────────────
     @staticmethod
-    def _volume_score(volume: int) -> float:
+    def _volume_score(volume: pd.Series) -> np.ndarray:
         """
         Map raw volume to a [-1, 1] scale.
         > 50 M  →  1.0   (very high conviction)
@@ -60,124 +86,108 @@ class AnalysisAgent:
         > 1 M   →  0.2
         else    →  0.0
         """
-        if volume > 50_000_000:
-            return 1.0
-        if volume > 10_000_000:
-            return 0.5
-        if volume >  1_000_000:
-            return 0.2
-        return 0.0
-
-    # ── Weighted impact formula ───────────────────────────────────────
+        v = volume.to_numpy()
+        return np.select(
+            [v > 50_000_000, v > 10_000_000, v > 1_000_000],
+            [1.0, 0.5, 0.2],
+            default=0.0,
+        )
+
+    # ── News × market join ────────────────────────────────────────────
     @staticmethod
-    def _impact_score(sentiment_num: float,
-                      movement: float,
-                      volume_score: float) -> float:
+    def _join(news_list: list, market: pd.DataFrame, now: str) -> pd.DataFrame:
         """
-        impact = w_sentiment * sentiment
-               + w_movement  * movement
-               + w_volume    * volume_score * sign(sentiment)
-
-        The volume term is multiplied by sign(sentiment) so that high
-        volume amplifies the direction the news points, not just magnitude.
+        One row per (article, distinct mentioned ticker) with market data.
+        Articles are exploded on their ticker list and hash-joined against
+        the market snapshot; index pseudo-tickers simply drop out.
         """
-        sign = 1 if sentiment_num >= 0 else -1
-        raw = (IMPACT_WEIGHTS["sentiment"] * sentiment_num
-             + IMPACT_WEIGHTS["movement"]  * movement
-             + IMPACT_WEIGHTS["volume"]    * volume_score * sign)
-        return round(raw, 4)
-
-    # ── Trend classification ──────────────────────────────────────────
+        if not news_list or market.empty:
+            return pd.DataFrame()
+
+        news_df = pd.DataFrame({
+            "sentiment_label": [a.get("sentiment", "neutral") for a in news_list],
+            "symbol":          [list(dict.fromkeys(a.get("companies", [])))
+                                for a in news_list],
+            "news_headline":   [a.get("title", "")            for a in news_list],
+            "summary":         [a.get("summary", "")          for a in news_list],
+            "keywords":        [a.get("keywords", [])         for a in news_list],
+            "timestamp":       [a.get("timestamp", now)       for a in news_list],
+        }).explode("symbol")
+
+        market_df = (
+            market
+            .reindex(columns=["open", "close", "high", "low", "volume"])
+            .fillna(0)
+            .astype({c: SCHEMA[c] for c in ("open", "close", "high", "low", "volume")})
+        )
+
+        joined = news_df.join(market_df, on="symbol", how="inner")
+        joined["matched_news"] = joined["news_headline"]
+        return joined.reset_index(drop=True)
+
+    # ── Frame → JSON records ──────────────────────────────────────────
     @staticmethod
-    def _trend(score: float) -> str:
-        if   score >  0.25: return "Strong Bullish"
-        elif score >  0.05: return "Moderate Bullish"
-        elif score >= -0.05: return "Neutral"
-        elif score >= -0.25: return "Moderate Bearish"
-        else:                return "Strong Bearish"
+    def _records(frame: pd.DataFrame) -> list:
+        """Widen float32 working columns and round, so JSON shows 430.44 not
+        430.44000244140625."""
+        widened = {c: "float64" for c in frame.select_dtypes("float32").columns}
+        return frame.astype(widened).round(4).to_dict(orient="records")
 
     # ── Main ──────────────────────────────────────────────────────────
     def run(self) -> dict:
         print("\n📊 [Analysis_Agent] Starting …")
 
         news_list   = self._load(PROCESSED_NEWS_FILE)   # list
-        market_data = self._load(MARKET_FILE)           # dict {ticker: …}
+        market      = self._load_market()               # DataFrame by ticker
 
         print(f"  News articles : {len(news_list)}")
-        print(f"  Market tickers: {len(market_data)}")
-
-        rows = []
-
-        for article in news_list:
-            title      = article.get("title", "")
-            summary    = article.get("summary", "")
-            sent_label = article.get("sentiment", "neutral")
-            sent_num   = self._sentiment_num(sent_label)
-            companies  = article.get("companies", [])
-            keywords   = article.get("keywords", [])
-            timestamp  = article.get("timestamp", str(datetime.now()))
-
-            # For each company the article mentions, look up market data
-            for ticker in companies:
-                if ticker not in market_data:
-                    continue                  # index pseudo-ticker or no data
-
-                mkt = market_data[ticker]
-                movement  = self._movement_score(mkt)
-                vol_score = self._volume_score(mkt.get("volume", 0))
-                impact    = self._impact_score(sent_num, movement, vol_score)
-
-                rows.append({
-                    "symbol":         ticker,
-                    "sentiment_label": sent_label,
-                    "sentiment_num":  sent_num,
-                    "movement_score": movement,
-                    "volume":         mkt.get("volume", 0),
-                    "volume_score":   vol_score,
-                    "impact_score":   impact,
-                    "trend":          self._trend(impact),
-                    "open":           mkt.get("open",  0),
-                    "close":          mkt.get("close", 0),
-                    "high":           mkt.get("high",  0),
-                    "low":            mkt.get("low",   0),
-                    "news_headline":  title,
-                    "matched_news":   title,
-                    "summary":        summary,
-                    "keywords":       keywords,
-                    "timestamp":      timestamp,
-                })
+        print(f"  Market tickers: {len(market)}")
+
+        now = str(datetime.now())          # run timestamp, shared by all rows
+        df  = self._join(news_list, market, now)
 
         # ── Aggregate: if a ticker appears in multiple articles,
         #     average the impact scores and keep the strongest headline ──
-        if rows:
-            df = pd.DataFrame(rows)
-
-            # per-ticker aggregation
-            agg = (
-                df.groupby("symbol")
-                .apply(lambda g: pd.Series({
-                    "symbol":         g.name,
-                    "avg_impact":     round(g["impact_score"].mean(), 4),
-                    "max_impact":     round(g["impact_score"].max(), 4),
-                    "min_impact":     round(g["impact_score"].min(), 4),
-                    "article_count":  len(g),
-                    "trend":          self._trend(g["impact_score"].mean()),
-                    "open":           g["open"].iloc[0],
-                    "close":          g["close"].iloc[0],
-                    "volume":         int(g["volume"].iloc[0]),
-                    "top_headline":   g.loc[g["impact_score"].idxmax(), "news_headline"],
-                    "top_summary":    g.loc[g["impact_score"].idxmax(), "summary"],
-                    "sentiment_label":g.loc[g["impact_score"].idxmax(), "sentiment_label"],
-                }), include_groups=False)
-                .reset_index(drop=True)
+        if not df.empty:
+            # score every (article, ticker) pair as whole-column ops
+            df["sentiment_num"]  = self._sentiment_num(df["sentiment_label"])
+            df["movement_score"] = self._movement_score(df)
+            df["volume_score"]   = self._volume_score(df["volume"])
+            df["impact_score"]   = impact_v1(
+                df["sentiment_num"].to_numpy(),
+                df["movement_score"].to_numpy(),
+                df["volume_score"].to_numpy(),
             )
-
-            top_bullish = (agg.sort_values("avg_impact", ascending=False)
-                           .head(10).to_dict(orient="records"))
-            top_bearish = (agg.sort_values("avg_impact", ascending=True)
-                           .head(10).to_dict(orient="records"))
-            full_list   = df.to_dict(orient="records")
-            aggregated  = agg.to_dict(orient="records")
+            df["trend"] = trend(df["impact_score"])
+            df = df[_ROW_COLUMNS].astype(
+                {c: t for c, t in SCHEMA.items() if c in _ROW_COLUMNS})
+
+            # per-ticker aggregation — one groupby pass over rows ranked by
+            # impact, so "first" of each group is the strongest article;
+            # groups come out alphabetical by symbol, as "aggregated" always was
+            ranked = df.sort_values("impact_score", ascending=False, kind="stable")
+            agg = ranked.groupby("symbol", sort=True).agg(
+                avg_impact=("impact_score", "mean"),
+                max_impact=("impact_score", "max"),
+                min_impact=("impact_score", "min"),
+                article_count=("impact_score", "size"),
+                open=("open", "first"),
+                close=("close", "first"),
+                volume=("volume", "first"),
+                top_headline=("news_headline", "first"),
+                top_summary=("summary", "first"),
+                sentiment_label=("sentiment_label", "first"),
+            )
+            # classify on the widened mean so float32 noise can't tip a
+            # score sitting exactly on a threshold (e.g. 0.05) over it
+            agg.insert(agg.columns.get_loc("article_count") + 1,
+                       "trend", trend(agg["avg_impact"].astype("float64").round(6)))
+            agg = agg.reset_index()
+
+            top_bullish = self._records(agg.nlargest(10, "avg_impact"))
+            top_bearish = self._records(agg.nsmallest(10, "avg_impact"))
+            full_list   = self._records(df)
+            aggregated  = self._records(agg)
         else:
             top_bullish = []
             top_bearish = []
@@ -185,15 +195,16 @@ class AnalysisAgent:
             aggregated  = []
 
         output = {
-            "generated_at":   str(datetime.now()),
+            "generated_at":   now,
+            "formula_versions": {name: FORMULA_VERSIONS[name]
+                                 for name in ("impact_v1", "trend")},
             "top_10_bullish": top_bullish,
             "top_10_bearish": top_bearish,
             "aggregated":     aggregated,
             "full_list":      full_list,
         }
 
-        with open(ANALYSIS_FILE, "w", encoding="utf-8") as f:
-            json.dump(output, f, indent=4, ensure_ascii=False)
+        dump_json(output, ANALYSIS_FILE)
 
         print(f"  ✅ Bullish: {len(top_bullish)} | Bearish: {len(top_bearish)} "
               f"| Total rows: {len(full_list)}")
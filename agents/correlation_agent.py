@@ -1,9 +1,10 @@
 # agents/correlation_agent.py
 
-import json
 import os
 from datetime import datetime
 
+from core.jsonio import load_json, dump_json
+
 
 class CorrelationAgent:
     """
@@ -19,8 +20,7 @@ class CorrelationAgent:
     # ------------------------------------------------------------------
     def _load(self, path: str) -> list | dict:
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f)
+            return load_json(path)
         except Exception as e:
             print(f"  ⚠️  Could not load {path}: {e}")
             return {} if path == self.market_data_file else []
@@ -52,6 +52,8 @@ class CorrelationAgent:
         print(f"   Market symbols: {len(market_data)}")
 
         final_output = []
+        market_keys  = market_data.keys()
+        now = str(datetime.now())          # one batch timestamp for defaults
 
         for article in news_list:
             title      = article.get("title", "")
@@ -59,24 +61,26 @@ class CorrelationAgent:
             sentiment  = article.get("sentiment", "neutral")
             companies  = article.get("companies", [])  # list of ticker symbols
             keywords   = article.get("keywords", [])
-            timestamp  = article.get("timestamp", str(datetime.now()))
+            timestamp  = article.get("timestamp", now)
 
             # Match tickers from the article against available market data
+            # (each ticker once, even if the article lists it twice)
             related_stocks = []
-            for ticker in companies:
-                if ticker in market_data:
-                    entry = market_data[ticker]
-                    score = self.intraday_movement_score(entry)
-
-                    related_stocks.append({
-                        "symbol":         ticker,
-                        "movement_score": score,
-                        "open":           entry.get("open",   0),
-                        "close":          entry.get("close",  0),
-                        "high":           entry.get("high",   0),
-                        "low":            entry.get("low",    0),
-                        "volume":         entry.get("volume", 0),
-                    })
+            for ticker in dict.fromkeys(companies):
+                if ticker not in market_keys:
+                    continue
+                entry = market_data[ticker]
+                score = self.intraday_movement_score(entry)
+
+                related_stocks.append({
+                    "symbol":         ticker,
+                    "movement_score": score,
+                    "open":           entry.get("open",   0),
+                    "close":          entry.get("close",  0),
+                    "high":           entry.get("high",   0),
+                    "low":            entry.get("low",    0),
+                    "volume":         entry.get("volume", 0),
+                })
 
             # Sort by absolute movement (most movement first)
             related_stocks.sort(key=lambda x: abs(x["movement_score"]), reverse=True)
@@ -92,8 +96,7 @@ class CorrelationAgent:
             })
 
         # Save
-        with open(self.output_file, "w", encoding="utf-8") as f:
-            json.dump(final_output, f, indent=4, ensure_ascii=False)
+        dump_json(final_output, self.output_file)
 
         print(f"✅ CorrelationAgent done → {self.output_file}\n")
         return final_output
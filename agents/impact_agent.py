@@ -1,11 +1,19 @@
 # agents/impact_agent.py
 
-import json
+import heapq
 import os
-
-import pandas as pd
+from operator import itemgetter
 
 from core.config import SENTIMENT_SCORE_MAP
+from core.jsonio import load_json, dump_json
+from core.scores import FORMULA_VERSIONS, impact_v2, trend
+
+# Column order of the per-(news, stock) rows in "full_list"
+_ROW_COLUMNS = [
+    "symbol", "company_name", "sentiment", "sentiment_num", "movement_score",
+    "impact_score", "trend", "news_headline", "matched_news", "summary",
+    "open", "close", "volume",
+]
 
 
 class ImpactAgent:
@@ -22,8 +30,7 @@ class ImpactAgent:
     # ------------------------------------------------------------------
     def _load_correlation(self) -> list:
         try:
-            with open(self.correlation_file, "r", encoding="utf-8") as f:
-                return json.load(f)
+            return load_json(self.correlation_file)
         except Exception as e:
             print(f"  ⚠️  Could not load {self.correlation_file}: {e}")
             return []
@@ -37,38 +44,16 @@ class ImpactAgent:
         """
         return SENTIMENT_SCORE_MAP.get(label.strip().lower(), 0.0)
 
-    # ------------------------------------------------------------------
-    @staticmethod
-    def compute_impact_score(sentiment_num: float, movement_score: float) -> float:
-        """
-        Weighted impact:
-            sentiment  → 60 %
-            movement   → 40 %
-        Both inputs should already be numeric.
-        """
-        return round((sentiment_num * 0.6) + (movement_score * 0.4), 4)
-
-    # ------------------------------------------------------------------
-    @staticmethod
-    def trend_strength(score: float) -> str:
-        if score > 0.25:
-            return "Strong Bullish"
-        elif 0.05 < score <= 0.25:
-            return "Moderate Bullish"
-        elif -0.05 <= score <= 0.05:
-            return "Neutral"
-        elif -0.25 <= score < -0.05:
-            return "Moderate Bearish"
-        else:
-            return "Strong Bearish"
-
     # ------------------------------------------------------------------
     def run(self):
         correlation_data = self._load_correlation()
 
         print("\n📊 ImpactAgent: computing impact scores …")
 
-        rows = []
+        # column-wise buffers: one list per output field, no per-row dicts
+        cols = {c: [] for c in ("symbol", "sentiment", "sentiment_num",
+                                "movement_score", "news_headline", "summary",
+                                "open", "close", "volume")}
 
         for news_item in correlation_data:
             sentiment_label = news_item.get("sentiment", "neutral")
@@ -77,44 +62,38 @@ class ImpactAgent:
             summary         = news_item.get("summary", "")
 
             for stock in news_item.get("related_stocks_ranked", []):
-                movement = stock.get("movement_score", 0.0)
-                impact   = self.compute_impact_score(sentiment_num, movement)
-
-                rows.append({
-                    "symbol":         stock["symbol"],
-                    "company_name":   stock["symbol"],   # ticker is the best we have
-                    "sentiment":      sentiment_label,
-                    "sentiment_num":  sentiment_num,
-                    "movement_score": movement,
-                    "impact_score":   impact,
-                    "trend":          self.trend_strength(impact),
-                    "news_headline":  title,
-                    "matched_news":   title,            # dashboard alerts use this key
-                    "summary":        summary,
-                    "open":           stock.get("open",   0),
-                    "close":          stock.get("close",  0),
-                    "volume":         stock.get("volume", 0),
-                })
-
-        # Build output even if rows is empty (dashboard handles that gracefully)
-        if rows:
-            df = pd.DataFrame(rows)
-            top_pos  = df.sort_values("impact_score", ascending=False).head(10)
-            top_neg  = df.sort_values("impact_score", ascending=True).head(10)
-            full     = df.to_dict(orient="records")
-        else:
-            top_pos  = pd.DataFrame()
-            top_neg  = pd.DataFrame()
-            full     = []
-
+                cols["symbol"].append(stock["symbol"])
+                cols["sentiment"].append(sentiment_label)
+                cols["sentiment_num"].append(sentiment_num)
+                cols["movement_score"].append(stock.get("movement_score", 0.0))
+                cols["news_headline"].append(title)
+                cols["summary"].append(summary)
+                cols["open"].append(stock.get("open",   0))
+                cols["close"].append(stock.get("close",  0))
+                cols["volume"].append(stock.get("volume", 0))
+
+        # Score whole columns at once, then zip back into row records
+        impact = impact_v2(cols["sentiment_num"], cols["movement_score"])
+        cols["impact_score"] = impact.tolist()
+        cols["trend"]        = trend(impact).tolist()
+        cols["company_name"] = cols["symbol"]          # ticker is the best we have
+        cols["matched_news"] = cols["news_headline"]   # dashboard alerts use this key
+
+        full = [dict(zip(_ROW_COLUMNS, values))
+                for values in zip(*(cols[c] for c in _ROW_COLUMNS))]
+
+        # Top-K by heap selection — O(N log 10) instead of two full sorts.
+        # Output is built even if there are no rows (dashboard handles that).
+        by_impact = itemgetter("impact_score")
         output = {
-            "top_10_positive_news_driven_stocks": top_pos.to_dict(orient="records") if not top_pos.empty else [],
-            "top_10_negative_news_driven_stocks": top_neg.to_dict(orient="records") if not top_neg.empty else [],
+            "formula_versions": {name: FORMULA_VERSIONS[name]
+                                 for name in ("impact_v2", "trend")},
+            "top_10_positive_news_driven_stocks": heapq.nlargest(10, full, key=by_impact),
+            "top_10_negative_news_driven_stocks": heapq.nsmallest(10, full, key=by_impact),
             "full_list": full
         }
 
-        with open(self.output_file, "w", encoding="utf-8") as f:
-            json.dump(output, f, indent=4, ensure_ascii=False)
+        dump_json(output, self.output_file)
 
         print(f"✅ ImpactAgent done → {self.output_file}")
         print(f"   Positive: {len(output['top_10_positive_news_driven_stocks'])} | "
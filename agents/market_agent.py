@@ -9,14 +9,15 @@ Fallback       : yfinance  (no key required)
 
 Input  : data/news_processed.json  (to know WHICH tickers matter most)
 Output : data/market_data.json           →  {ticker: {ohlcv + news_linked flag}}
+         data/market_data.parquet        →  same snapshot as typed columns
          data/stock_trend_history.csv    →  8-day daily close for trend chart
 """
 
 import os
-import json
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-import requests
 import pandas as pd
 import yfinance as yf
 from dotenv import load_dotenv
@@ -26,25 +27,46 @@ from core.config import (
     US_MARKET_SYMBOLS,
     PROCESSED_NEWS_FILE,
     MARKET_FILE,
+    MARKET_PARQUET_FILE,
     TREND_HISTORY_FILE,
+    SCHEMA,
 )
+from core.http_session import build_session
+from core.jsonio import load_json, dump_json
 
 load_dotenv()
 
 AV_BASE = "https://www.alphavantage.co/query"
+AV_RATE_LIMIT  = 5       # Alpha Vantage free tier: 5 requests …
+AV_RATE_WINDOW = 60.0    # … per rolling 60 s window
+YF_MAX_WORKERS = 16      # yfinance has no hard rate cap; fetch in parallel
+
+# Columns of the Parquet market snapshot (types from core.config.SCHEMA)
+_PARQUET_COLUMNS = ["symbol", "timestamp", "open", "high", "low", "close",
+                    "volume", "news_linked"]
 
 
 class MarketAgent:
     def __init__(self):
         os.makedirs("data", exist_ok=True)
         self._av_blocked = not bool(ALPHA_VANTAGE_API_KEY)
+        self._av_calls   = deque()      # monotonic times of recent AV calls
+        self._session    = build_session(pool_size=4)   # keep-alive to AV
+
+    # ── Alpha Vantage token bucket (5 req / rolling minute) ──────────
+    def _av_throttle(self):
+        now = time.monotonic()
+        while self._av_calls and now - self._av_calls[0] >= AV_RATE_WINDOW:
+            self._av_calls.popleft()
+        if len(self._av_calls) >= AV_RATE_LIMIT:
+            time.sleep(AV_RATE_WINDOW - (now - self._av_calls.popleft()))
+        self._av_calls.append(time.monotonic())
 
     # ── Collect tickers that news actually mentions ──────────────────
     @staticmethod
     def _tickers_from_news() -> set:
         try:
-            with open(PROCESSED_NEWS_FILE, "r", encoding="utf-8") as f:
-                articles = json.load(f)
+            articles = load_json(PROCESSED_NEWS_FILE)
             tickers = set()
             for a in articles:
                 tickers.update(a.get("companies", []))
@@ -61,7 +83,7 @@ class MarketAgent:
             "apikey":   ALPHA_VANTAGE_API_KEY,
         }
         try:
-            resp = requests.get(AV_BASE, params=params, timeout=15)
+            resp = self._session.get(AV_BASE, params=params, timeout=15)
             data = resp.json()
         except Exception as e:
             print(f"    ⚠️  AV request error ({symbol}): {e}")
@@ -110,33 +132,62 @@ class MarketAgent:
             print(f"    ⚠️  yfinance error ({symbol}): {e}")
             return None
 
+    # ── Typed columnar snapshot for downstream agents ────────────────
+    @staticmethod
+    def _write_parquet(market_data: dict):
+        try:
+            (pd.DataFrame(list(market_data.values()), columns=_PARQUET_COLUMNS)
+             .astype({c: SCHEMA[c] for c in _PARQUET_COLUMNS if c in SCHEMA})
+             .to_parquet(MARKET_PARQUET_FILE, index=False, compression="zstd"))
+            print(f"  ✅ Market snapshot → {MARKET_PARQUET_FILE}")
+        except Exception as e:
+            # never leave a stale snapshot behind; readers fall back to JSON
+            print(f"    ⚠️  Parquet snapshot failed: {e}")
+            if os.path.exists(MARKET_PARQUET_FILE):
+                os.remove(MARKET_PARQUET_FILE)
+
     # ── 8-day trend history (yfinance only, one batch call) ───────────
     @staticmethod
     def _build_trend_csv(symbols: list):
         print("  📊 Building 8-day trend history …")
-        rows = []
+        frames = []
+        try:
+            hist = yf.download(
+                symbols, period="8d", interval="1d",
+                group_by="ticker", progress=False, threads=True,
+            ) if symbols else pd.DataFrame()
+        except Exception as e:
+            print(f"    ⚠️  Trend download error: {e}")
+            hist = pd.DataFrame()
+
+        if hist.empty:
+            print("  ⚠️  No trend data collected.")
+            return
+
         for sym in symbols:
             try:
-                hist = yf.download(sym, period="8d", interval="1d", progress=False)
-                if hist.empty:
-                    continue
                 if isinstance(hist.columns, pd.MultiIndex):
-                    hist.columns = hist.columns.get_level_values(0)
-                base_price = float(hist["Close"].iloc[0])
+                    if sym not in hist.columns.get_level_values(0):
+                        continue
+                    close = hist[sym]["Close"].dropna()
+                else:                                  # single-ticker layout
+                    close = hist["Close"].dropna()
+                if close.empty:
+                    continue
+                base_price = float(close.iloc[0])
                 if base_price == 0:
                     continue
-                for idx, row in hist.iterrows():
-                    rows.append({
-                        "date":        str(idx.date()),
-                        "symbol":      sym,
-                        "close":       round(float(row["Close"]), 2),
-                        "trend_score": round(float(row["Close"]) / base_price - 1, 4),
-                    })
+                frames.append(pd.DataFrame({
+                    "date":        close.index.strftime("%Y-%m-%d"),
+                    "symbol":      sym,
+                    "close":       close.round(2).to_numpy(),
+                    "trend_score": (close / base_price - 1).round(4).to_numpy(),
+                }))
             except Exception as e:
                 print(f"    ⚠️  Trend error ({sym}): {e}")
 
-        if rows:
-            pd.DataFrame(rows).to_csv(TREND_HISTORY_FILE, index=False)
+        if frames:
+            pd.concat(frames, ignore_index=True).to_csv(TREND_HISTORY_FILE, index=False)
             print(f"  ✅ Trend history → {TREND_HISTORY_FILE}")
         else:
             print("  ⚠️  No trend data collected.")
@@ -144,6 +195,8 @@ class MarketAgent:
     # ── Main ──────────────────────────────────────────────────────────
     def run(self, symbols: list | None = None) -> dict:
         print("\n📈 [Market_Agent] Starting …")
+        # an AV rate-limit hit only sticks for one run (agent may be reused)
+        self._av_blocked = not bool(ALPHA_VANTAGE_API_KEY)
 
         # Priority: tickers mentioned in news first, then fill with top list
         news_tickers = self._tickers_from_news()
@@ -166,32 +219,43 @@ class MarketAgent:
         print(f"  Fetching {len(symbols)} symbols "
               f"({len(news_tickers)} from news + {len(symbols)-len(news_tickers)} top list) …")
 
-        market_data = {}
-        for symbol in symbols:
-            print(f"    📈 {symbol} …", end=" ", flush=True)
-
-            entry = None
-            if not self._av_blocked:
-                entry = self._fetch_av(symbol)
-                if entry:
-                    print("(AV ✓)")
-                time.sleep(12)      # Alpha Vantage free-tier: 5 req/min
+        fetched = {}
+        with ThreadPoolExecutor(max_workers=YF_MAX_WORKERS) as pool:
+            # Alpha Vantage is rate-capped, so it runs sequentially; every
+            # miss is handed to the yfinance pool straight away and those
+            # fetches overlap with the AV throttle waits.
+            yf_jobs = {}
+            for symbol in symbols:
+                if not self._av_blocked:
+                    self._av_throttle()
+                    entry = self._fetch_av(symbol)
+                    if entry:
+                        print(f"    📈 {symbol} … (AV ✓)")
+                        fetched[symbol] = entry
+                        continue
+                yf_jobs[pool.submit(self._fetch_yf, symbol)] = symbol
 
-            if entry is None:
-                entry = self._fetch_yf(symbol)
+            for future in as_completed(yf_jobs):
+                symbol = yf_jobs[future]
+                entry  = future.result()
                 if entry:
-                    print("(yf ✓)")
+                    print(f"    📈 {symbol} … (yf ✓)")
+                    fetched[symbol] = entry
                 else:
-                    print("(no data)")
+                    print(f"    📈 {symbol} … (no data)")
 
+        # keep the news-first symbol order for the snapshot and trend chart
+        market_data = {}
+        for symbol in symbols:
+            entry = fetched.get(symbol)
             if entry:
                 entry["news_linked"] = symbol in news_tickers
                 market_data[symbol]  = entry
 
         # Save snapshot
-        with open(MARKET_FILE, "w", encoding="utf-8") as f:
-            json.dump(market_data, f, indent=4)
+        dump_json(market_data, MARKET_FILE)
         print(f"  ✅ Market snapshot → {MARKET_FILE}")
+        self._write_parquet(market_data)
 
         # Build trend CSV for dashboard chart
         self._build_trend_csv(list(market_data.keys())[:15])  # cap at 15 for speed
@@ -8,12 +8,12 @@ Fallback       : RSS feeds from Reuters, CNBC, Yahoo Finance
 Output         : data/news_raw.json   →  list of {title, url, content, timestamp}
 """
 
-import json
 import os
+import re
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
-import requests
 import feedparser
 
 from core.config import (
@@ -23,7 +23,10 @@ from core.config import (
     NEWSAPI_CATEGORY,
     NEWSAPI_PAGE_SIZE,
     RAW_NEWS_FILE,
+    RSS_CACHE_FILE,
 )
+from core.http_session import build_session
+from core.jsonio import load_json, dump_json
 
 # ─── US-finance keyword filter ──────────────────────────────────────────
 FINANCE_KEYWORDS = [
@@ -40,10 +43,15 @@ FINANCE_KEYWORDS = [
     "jpmorgan", "goldman", "morgan stanley", "blackrock",
 ]
 
+# One alternation over every keyword (longest first) → single scan per article
+_FINANCE_RE = re.compile(
+    "|".join(sorted(map(re.escape, FINANCE_KEYWORDS), key=len, reverse=True))
+)
+
 
 def _is_financial(title: str, content: str) -> bool:
     text = (title + " " + content).lower()
-    return any(kw in text for kw in FINANCE_KEYWORDS)
+    return _FINANCE_RE.search(text) is not None
 
 
 class NewsAgent:
@@ -57,6 +65,7 @@ class NewsAgent:
 
     def __init__(self):
         os.makedirs("data", exist_ok=True)
+        self._session = build_session(pool_size=len(self.RSS_FEEDS))
 
     # ── Primary: NewsAPI ──────────────────────────────────────────────
     def _fetch_newsapi(self, limit: int = 30) -> list:
@@ -75,7 +84,7 @@ class NewsAgent:
         }
 
         try:
-            resp = requests.get(url, params=params, timeout=15)
+            resp = self._session.get(url, params=params, timeout=15)
             resp.raise_for_status()
             data = resp.json()
         except Exception as e:
@@ -87,6 +96,7 @@ class NewsAgent:
             return []
 
         articles = []
+        now = str(datetime.now())          # one fetch timestamp for the batch
         for item in data.get("articles", []):
             title   = (item.get("title") or "").strip()
             content = (item.get("content") or item.get("description") or "").strip()
@@ -100,7 +110,7 @@ class NewsAgent:
             articles.append({
                 "title":     title,
                 "url":       url_art,
-                "timestamp": str(datetime.now()),
+                "timestamp": now,
                 "content":   content,
             })
             print(f"    ✓ [{len(articles)}] {title[:90]}")
@@ -108,42 +118,90 @@ class NewsAgent:
         print(f"  ✅ NewsAPI returned {len(articles)} financial articles.")
         return articles
 
+    # ── RSS feed fetch with conditional GET (ETag / Last-Modified) ────
+    def _fetch_feed(self, feed_url: str, cached: dict) -> dict | None:
+        """
+        Return the cache record {etag, last_modified, entries} for one feed.
+        A 304 reply reuses the cached entries without re-parsing anything.
+        """
+        headers = {}
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+        try:
+            resp = self._session.get(feed_url, headers=headers, timeout=15)
+            if resp.status_code == 304 and "entries" in cached:
+                return cached
+            resp.raise_for_status()
+            feed = feedparser.parse(resp.content)
+        except Exception as e:
+            print(f"    ⚠️  RSS fetch error ({feed_url}): {e}")
+            return None
+
+        return {
+            "etag":          resp.headers.get("ETag", ""),
+            "last_modified": resp.headers.get("Last-Modified", ""),
+            "entries": [
+                {
+                    "title":   (entry.get("title") or "").strip(),
+                    "link":    (entry.get("link") or "").strip(),
+                    "summary": (entry.get("summary") or "").strip(),
+                }
+                for entry in feed.entries
+            ],
+        }
+
     # ── Fallback: RSS ─────────────────────────────────────────────────
     def _fetch_rss(self, limit: int = 30) -> list:
         print("  📡 Fetching via RSS feeds …")
+        try:
+            cache = load_json(RSS_CACHE_FILE)
+        except Exception:
+            cache = {}
+
+        # network-bound: fetch every feed at once, wall clock = slowest feed
+        with ThreadPoolExecutor(max_workers=len(self.RSS_FEEDS)) as pool:
+            records = list(pool.map(
+                lambda url: self._fetch_feed(url, cache.get(url, {})),
+                self.RSS_FEEDS,
+            ))
+
         articles   = []
         seen       = set()
+        now        = str(datetime.now())   # one fetch timestamp for the batch
+
+        # dedupe + filter once all feeds are in, keeping feed priority order
+        for feed_url, record in zip(self.RSS_FEEDS, records):
+            if record is None:
+                continue
+            cache[feed_url] = record
+
+            for entry in record["entries"]:
+                if len(articles) >= limit:
+                    break
+
+                title   = entry["title"]
+                url_art = entry["link"]
+                content = entry["summary"]
+
+                if title.lower() in seen:
+                    continue
+                seen.add(title.lower())
+
+                if not _is_financial(title, content):
+                    continue
+
+                articles.append({
+                    "title":     title,
+                    "url":       url_art,
+                    "timestamp": now,
+                    "content":   content,
+                })
+                print(f"    ✓ [{len(articles)}] {title[:90]}")
 
-        for feed_url in self.RSS_FEEDS:
-            try:
-                feed = feedparser.parse(feed_url)
-                for entry in feed.entries:
-                    title   = (entry.get("title") or "").strip()
-                    url_art = (entry.get("link") or "").strip()
-                    content = (entry.get("summary") or "").strip()
-
-                    if title.lower() in seen:
-                        continue
-                    seen.add(title.lower())
-
-                    if not _is_financial(title, content):
-                        continue
-
-                    articles.append({
-                        "title":     title,
-                        "url":       url_art,
-                        "timestamp": str(datetime.now()),
-                        "content":   content,
-                    })
-                    print(f"    ✓ [{len(articles)}] {title[:90]}")
-
-                    if len(articles) >= limit:
-                        break
-            except Exception as e:
-                print(f"    ⚠️  RSS parse error ({feed_url}): {e}")
-
-            if len(articles) >= limit:
-                break
+        dump_json(cache, RSS_CACHE_FILE, indent=False)
 
         print(f"  ✅ RSS collected {len(articles)} financial articles.")
         return articles
@@ -158,8 +216,7 @@ class NewsAgent:
             print("  🔄 Falling back to RSS …")
             articles = self._fetch_rss(limit=30)
 
-        with open(RAW_NEWS_FILE, "w", encoding="utf-8") as f:
-            json.dump(articles, f, indent=4, ensure_ascii=False)
+        dump_json(articles, RAW_NEWS_FILE)
 
         print(f"  🎉 Saved {len(articles)} articles → {RAW_NEWS_FILE}\n")
         return articles
@@ -1,44 +1,95 @@
 # agents/nlp_agent.py
 """
 AGENT 2 — NLP_Agent
-Responsibility : Pre-process raw news with spaCy, summarise with BART,
-                 extract keywords with KeyBERT, score sentiment with BERT,
+Responsibility : Summarise raw news with DistilBART, extract keywords from
+                 the summaries with KeyBERT, score sentiment with BERT,
                  and tag which US companies are mentioned.
 
 Input  : data/news_raw.json        (written by News_Agent)
 Output : data/news_processed.json  →  list of enriched article dicts
+
+NLTK, torch and the HuggingFace stacks are imported when an
+NLPAgent is built, not at module import, so importing this module (e.g.
+via crew_pipeline) stays cheap for runs that never reach the NLP step.
 """
 
+import hashlib
 import os
-import json
+import time
 from datetime import datetime
 
-import spacy
-import nltk
-from transformers import pipeline as hf_pipeline
-from keybert import KeyBERT
-
 from core.config import (
     COMPANY_TICKER_MAP,
+    COMPANY_MATCHER,
+    SUMMARIZER_MODEL,
+    SENTIMENT_MODEL,
+    KEYWORD_MODEL,
+    NLP_SUMMARY_BATCH_SIZE,
+    NLP_SENTIMENT_BATCH_SIZE,
+    NLP_KEYWORD_BATCH_SIZE,
+    NLP_CPU_INT8,
     RAW_NEWS_FILE,
     PROCESSED_NEWS_FILE,
+    NLP_CACHE_FILE,
+    NLP_CACHE_TTL,
 )
+from core.jsonio import load_json, dump_json
+
 
 # ─── one-time NLTK data download ────────────────────────────────────────
-try:
-    nltk.data.find("tokenizers/punkt_tab")
-except LookupError:
-    nltk.download("punkt_tab", quiet=True)
+def _ensure_nltk_data():
+    import nltk
+    try:
+        nltk.data.find("tokenizers/punkt_tab")
+    except LookupError:
+        nltk.download("punkt_tab", quiet=True)
 
 
-# ─── Load spaCy model (small English model, fast) ──────────────────────
-def _load_spacy():
-    try:
-        return spacy.load("en_core_web_sm")
-    except OSError:
-        print("  ⏳ Downloading spaCy en_core_web_sm …")
-        spacy.cli.download("en_core_web_sm")
-        return spacy.load("en_core_web_sm")
+# ─── Device selection + reduced-precision model loading ────────────────
+def _device() -> str:
+    """'cuda' when a GPU is visible, else 'cpu' — used for every model."""
+    import torch
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+
+def _load_mode() -> str:
+    """How the models are loaded (see _shrink): precision changes outputs."""
+    if _device() == "cuda":
+        return "cuda-fp16"
+    return "cpu-int8" if NLP_CPU_INT8 else "cpu-fp32"
+
+
+def _shrink(model):
+    """
+    FP16 weights on GPU; dynamic int8 Linear layers on CPU (if enabled).
+    Halves (or quarters) weight bandwidth for every forward pass.
+    """
+    import torch
+    if _device() == "cuda":
+        return model.half().to("cuda")
+    if NLP_CPU_INT8:
+        return torch.quantization.quantize_dynamic(
+            model, {torch.nn.Linear}, dtype=torch.qint8)
+    return model
+
+
+def _load_hf_pipeline(task: str, model_name: str, model_cls):
+    import torch
+    from transformers import AutoTokenizer, pipeline as hf_pipeline
+
+    # load FP16 weights directly on GPU rather than materialising FP32 first
+    dtype = torch.float16 if _device() == "cuda" else None
+    model = _shrink(model_cls.from_pretrained(model_name, torch_dtype=dtype).eval())
+    return hf_pipeline(
+        task,
+        model=model,
+        tokenizer=AutoTokenizer.from_pretrained(model_name),
+        device=0 if _device() == "cuda" else -1,
+    )
+
+
+# Placeholder summary when the summariser errors out
+_SUMMARY_UNAVAILABLE = "Summary unavailable."
 
 
 # ─── Company extraction helper ─────────────────────────────────────────
@@ -47,156 +98,273 @@ def extract_companies(text: str) -> list:
     Scan *text* for every company name in COMPANY_TICKER_MAP.
     Return deduplicated list of ticker symbols.
     """
-    lower = text.lower()
-    found = {}                                   # ticker → name (dedup)
-    for name, ticker in COMPANY_TICKER_MAP.items():
-        if name in lower:
-            found[ticker] = name
-    return list(found.keys())
+    names = COMPANY_MATCHER.findall(text.lower())
+    return list(dict.fromkeys(COMPANY_TICKER_MAP[name] for name in names))
+
+
+# ─── NLP result cache helpers ──────────────────────────────────────────
+def _cache_key(raw_text: str, summary_input: str, load_mode: str) -> str:
+    """
+    Hash of the exact model inputs, the model names and their load mode,
+    so an edited headline, a model swap (e.g. SUMMARIZER_MODEL override)
+    or a precision change (NLP_CPU_INT8, GPU host) never reuses stale
+    outputs.
+    """
+    parts = (SUMMARIZER_MODEL, SENTIMENT_MODEL, KEYWORD_MODEL, load_mode,
+             raw_text, summary_input)
+    return hashlib.blake2b("\0".join(parts).encode(), digest_size=16).hexdigest()
 
 
 class NLPAgent:
     def __init__(self):
-        print("  ⏳ Loading spaCy …")
-        self.nlp = _load_spacy()
+        from keybert import KeyBERT
+        from sentence_transformers import SentenceTransformer
+        from transformers import (
+            AutoModelForSeq2SeqLM,
+            AutoModelForSequenceClassification,
+        )
+
+        _ensure_nltk_data()
 
-        print("  ⏳ Loading BART summariser …")
-        self.summariser = hf_pipeline(
+        print(f"  🖥️  NLP device: {_device()}")
+
+        print(f"  ⏳ Loading summariser ({SUMMARIZER_MODEL}) …")
+        self.summariser = _load_hf_pipeline(
             "summarization",
-            model="facebook/bart-large-cnn",
+            SUMMARIZER_MODEL,
+            AutoModelForSeq2SeqLM,
         )
 
         print("  ⏳ Loading BERT sentiment model …")
-        self.sentiment_model = hf_pipeline(
+        self.sentiment_model = _load_hf_pipeline(
             "sentiment-analysis",
-            model="nlptown/bert-base-multilingual-uncased-sentiment",
+            SENTIMENT_MODEL,
+            AutoModelForSequenceClassification,
         )
 
         print("  ⏳ Loading KeyBERT …")
-        self.keyword_model = KeyBERT()
+        self.keyword_model = KeyBERT(model=_shrink(
+            SentenceTransformer(KEYWORD_MODEL, device=_device()).eval()))
 
         os.makedirs("data", exist_ok=True)
         print("  ✅ NLP_Agent models ready.\n")
 
-    # ── spaCy preprocessing ───────────────────────────────────────────
-    def preprocess(self, text: str) -> str:
+    # ── Cache load (expired entries dropped) ──────────────────────────
+    @staticmethod
+    def _load_cache() -> dict:
+        try:
+            cache = load_json(NLP_CACHE_FILE)
+        except Exception:
+            return {}
+        cutoff = time.time() - NLP_CACHE_TTL
+        return {key: entry for key, entry in cache.items()
+                if entry.get("cached_at", 0) >= cutoff}
+
+    # ── BART summarisation (batched) ──────────────────────────────────
+    def summarise_batch(self, texts: list) -> tuple:
         """
-        spaCy pipeline:
-          1. Tokenise
-          2. Lemmatise every token
-          3. Drop stopwords, punctuation, spaces, numbers
-          4. Keep only NOUN, VERB, ADJ, ADV
-          5. Return cleaned text (preserves readable words)
+        Summarise every text in one batched pipeline call.
+        Texts shorter than 60 chars are passed through unchanged.
+        Returns (summaries, indices that failed and got the placeholder).
         """
-        if not text:
-            return ""
-
-        doc = self.nlp(text[:5000])          # spaCy has a token limit; be safe
-
-        allowed_pos = {"NOUN", "VERB", "ADJ", "ADV", "PROPN"}
-        tokens = [
-            token.lemma_.strip()
-            for token in doc
-            if (not token.is_stop
-                and not token.is_punct
-                and not token.is_space
-                and not token.like_num
-                and token.pos_ in allowed_pos
-                and len(token.lemma_.strip()) > 1)
-        ]
-        return " ".join(tokens)
-
-    # ── BART summarisation ────────────────────────────────────────────
-    def summarise(self, text: str) -> str:
-        if not text or len(text) < 60:
-            return text or ""
-        try:
-            result = self.summariser(
-                text[:3000],
-                max_length=150,
-                min_length=30,
-                do_sample=False,
-            )
-            return result[0]["summary_text"]
-        except Exception as e:
-            print(f"    ⚠️  Summarisation failed: {e}")
-            return "Summary unavailable."
-
-    # ── BERT sentiment ────────────────────────────────────────────────
-    def sentiment(self, text: str) -> str:
-        """Returns raw label e.g. '4 stars'."""
-        if not text:
-            return "neutral"
+        summaries = [text or "" for text in texts]
+        todo = [i for i, text in enumerate(texts) if text and len(text) >= 60]
+        if not todo:
+            return summaries, set()
+        # similar lengths share a batch, so little of each batch is padding
+        todo.sort(key=lambda i: len(texts[i]))
+        import torch
+        options = dict(
+            truncation=True,               # at the model limit (1024 tokens)
+            max_length=150,
+            min_length=30,
+            do_sample=False,
+        )
         try:
-            result = self.sentiment_model(text[:512])[0]
-            return result["label"]
+            with torch.inference_mode():
+                results = self.summariser(
+                    [texts[i] for i in todo],
+                    batch_size=NLP_SUMMARY_BATCH_SIZE,
+                    **options,
+                )
+            for i, result in zip(todo, results):
+                summaries[i] = result["summary_text"]
+            return summaries, set()
         except Exception as e:
-            print(f"    ⚠️  Sentiment failed: {e}")
-            return "neutral"
-
-    # ── KeyBERT keywords ──────────────────────────────────────────────
-    def keywords(self, text: str) -> list:
-        if not text:
-            return []
+            print(f"    ⚠️  Batched summarisation failed ({e}) — retrying per article")
+
+        # one bad input must not cost every article its summary
+        failed = set()
+        for i in todo:
+            try:
+                with torch.inference_mode():
+                    result = self.summariser([texts[i]], **options)[0]
+                summaries[i] = result["summary_text"]
+            except Exception as e:
+                print(f"    ⚠️  Summarisation failed: {e}")
+                summaries[i] = _SUMMARY_UNAVAILABLE
+                failed.add(i)
+        return summaries, failed
+
+    # ── BERT sentiment (batched) ──────────────────────────────────────
+    def sentiment_batch(self, texts: list) -> tuple:
+        """
+        Returns (one raw label per text, e.g. '4 stars', indices that
+        failed and were left 'neutral').
+        """
+        labels = ["neutral"] * len(texts)
+        todo = [i for i, text in enumerate(texts) if text]
+        if not todo:
+            return labels, set()
+        todo.sort(key=lambda i: len(texts[i]))
+        import torch
+        options = dict(padding=True, truncation=True, max_length=512)
         try:
-            return [kw[0] for kw in self.keyword_model.extract_keywords(text, top_n=7)]
+            with torch.inference_mode():
+                results = self.sentiment_model(
+                    [texts[i] for i in todo],
+                    batch_size=NLP_SENTIMENT_BATCH_SIZE,
+                    **options,
+                )
+            for i, result in zip(todo, results):
+                labels[i] = result["label"]
+            return labels, set()
         except Exception as e:
-            print(f"    ⚠️  Keyword extraction failed: {e}")
-            return []
+            print(f"    ⚠️  Batched sentiment failed ({e}) — retrying per article")
+
+        # one bad input must not turn every article 'neutral'
+        failed = set()
+        for i in todo:
+            try:
+                with torch.inference_mode():
+                    labels[i] = self.sentiment_model([texts[i]], **options)[0]["label"]
+            except Exception as e:
+                print(f"    ⚠️  Sentiment failed: {e}")
+                failed.add(i)
+        return labels, failed
+
+    # ── KeyBERT keywords (batched) ────────────────────────────────────
+    def keywords_batch(self, texts: list) -> tuple:
+        """
+        Top-7 keywords per text. Documents are embedded in
+        NLP_KEYWORD_BATCH_SIZE chunks; each chunk is one KeyBERT call.
+        Returns (keyword lists, indices whose chunk failed and got []).
+        """
+        import torch
+        keywords = [[] for _ in texts]
+        failed = set()
+        todo = [i for i, text in enumerate(texts) if text]
+        for start in range(0, len(todo), NLP_KEYWORD_BATCH_SIZE):
+            chunk = todo[start:start + NLP_KEYWORD_BATCH_SIZE]
+            try:
+                with torch.inference_mode():
+                    results = self.keyword_model.extract_keywords(
+                        [texts[i] for i in chunk], top_n=7)
+            except Exception as e:
+                print(f"    ⚠️  Keyword extraction failed: {e}")
+                failed.update(chunk)
+                continue
+            # KeyBERT unwraps a single-document result to a flat list
+            if len(chunk) == 1 and results and isinstance(results[0], tuple):
+                results = [results]
+            for i, kws in zip(chunk, results):
+                keywords[i] = [kw[0] for kw in kws]
+        return keywords, failed
 
     # ── Main processing loop ──────────────────────────────────────────
     def process(self, news_list: list) -> list:
-        processed = []
+        now = str(datetime.now())          # one batch timestamp for defaults
 
+        # Single scan over the articles: each record's own fields, its model
+        # inputs, its cache key and its company tags, all in one pass.
+        processed, raw_texts, summary_inputs, keys = [], [], [], []
+        load_mode = _load_mode()
         for item in news_list:
-            title     = item.get("title", "")
-            content   = item.get("content", "")
-            url       = item.get("url", "")
-            timestamp = item.get("timestamp", str(datetime.now()))
-
-            print(f"  📝 {title[:80]}")
+            title   = item.get("title", "")
+            content = item.get("content", "")
+            url     = item.get("url", "")
 
             # raw combined text for NLP
-            raw_text  = f"{title}. {content}" if content else title
-
-            # 1. spaCy clean text (used for keyword extraction)
-            cleaned   = self.preprocess(raw_text)
-
-            # 2. BART summary (on the original, not cleaned — readability)
-            summary   = self.summarise(content if content else title)
+            raw_text = f"{title}. {content}" if content else title
+            summary_input = content if content else title
+            raw_texts.append(raw_text)
+            summary_inputs.append(summary_input)
+            keys.append(_cache_key(raw_text, summary_input, load_mode))
 
-            # 3. BERT sentiment (on original text)
-            sent      = self.sentiment(raw_text)
-
-            # 4. KeyBERT on the spaCy-cleaned text (better signal)
-            kws       = self.keywords(cleaned if cleaned else raw_text)
-
-            # 5. Company-ticker tagging
-            companies = extract_companies(raw_text)
+            print(f"  📝 {title[:80]}")
 
             processed.append({
                 "title":     title,
                 "url":       url,
-                "timestamp": timestamp,
-                "cleaned_text": cleaned,
+                "timestamp": item.get("timestamp", now),
+                "summary":   None,         # model fields filled in below
+                "sentiment": None,
+                "keywords":  None,
+                # Company-ticker tagging (cheap — always redone, so edits to
+                # COMPANY_TICKER_MAP apply to cached articles too)
+                "companies": extract_companies(raw_text),
+            })
+
+        # Model outputs are cached per model input: on scheduler runs most
+        # articles were already seen, so only new ones go through the models.
+        cache = self._load_cache()
+        first = {}
+        for i, key in enumerate(keys):
+            first.setdefault(key, i)       # duplicate articles processed once
+        todo  = [i for key, i in first.items() if key not in cache]
+        print(f"  ♻️  NLP cache: {len(news_list) - len(todo)} hits, {len(todo)} to process")
+
+        todo_raw = [raw_texts[i] for i in todo]
+
+        # 1. BART summaries, one batched call (on the original text —
+        #    readability)
+        summaries, failed = self.summarise_batch([summary_inputs[i] for i in todo])
+
+        # 2. BERT sentiment, one batched call (on original text)
+        sentiments, sentiment_failed = self.sentiment_batch(todo_raw)
+
+        # 3. KeyBERT on the summaries — already dense in content words, so
+        #    no cleaning pass is needed; raw text if summarising failed
+        keywords, keyword_failed = self.keywords_batch(
+            [raw_text if j in failed else summary
+             for j, (summary, raw_text) in enumerate(zip(summaries, todo_raw))]
+        )
+        failed |= sentiment_failed | keyword_failed
+
+        # Every fresh result goes into this run's output, but only articles
+        # whose model calls all succeeded are cached — a transient failure
+        # (e.g. CUDA OOM) is retried on the next run, not pinned for the TTL.
+        results   = {}
+        cached_at = time.time()
+        for j, (i, summary, sent, kws) in enumerate(
+                zip(todo, summaries, sentiments, keywords)):
+            results[keys[i]] = {
                 "summary":   summary,
                 "sentiment": sent,
                 "keywords":  kws,
-                "companies": companies,
-            })
+                "cached_at": cached_at,
+            }
+            if j not in failed:
+                cache[keys[i]] = results[keys[i]]
+        if failed:
+            print(f"  ⚠️  {len(failed)} article(s) not cached — retried next run")
+
+        for record, key in zip(processed, keys):
+            result = results.get(key) or cache[key]
+            record["summary"]   = result["summary"]
+            record["sentiment"] = result["sentiment"]
+            record["keywords"]  = result["keywords"]
 
         # Save
-        with open(PROCESSED_NEWS_FILE, "w", encoding="utf-8") as f:
-            json.dump(processed, f, indent=4, ensure_ascii=False)
+        dump_json(processed, PROCESSED_NEWS_FILE, indent=False)
+        dump_json(cache, NLP_CACHE_FILE, indent=False)
 
         print(f"  ✅ Processed {len(processed)} articles → {PROCESSED_NEWS_FILE}\n")
         return processed
 
-
 if __name__ == "__main__":
     if os.path.exists(RAW_NEWS_FILE):
-        with open(RAW_NEWS_FILE, "r", encoding="utf-8") as f:
-            raw = json.load(f)
+        raw = load_json(RAW_NEWS_FILE)
         NLPAgent().process(raw)
     else:
         print(f"❌ {RAW_NEWS_FILE} not found — run News_Agent first.")
@@ -1,5 +1,6 @@
 # core/config.py
 import os
+import re
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -33,7 +34,7 @@ US_MARKET_SYMBOLS = [
 
 # ─────────────────────────────────────────────
 # COMPANY NAME  →  TICKER  (used by NLP_Agent to tag articles)
-# Keys are all lower-case; matching is case-insensitive substring.
+# Keys are all lower-case; matching is case-insensitive, whole words only.
 # ─────────────────────────────────────────────
 COMPANY_TICKER_MAP = {
     # mega-cap tech
@@ -90,14 +91,44 @@ COMPANY_TICKER_MAP = {
     "wall street":      "SPY",
 }
 
+# Built once at import and shared process-wide: every name in one compiled
+# alternation (longest first, whole words only), so an article is scanned
+# once instead of once per name. Match against lower-cased text.
+COMPANY_NAMES_LOWER = tuple(map(str.lower, COMPANY_TICKER_MAP))
+COMPANY_MATCHER = re.compile(
+    r"\b(" + "|".join(sorted(map(re.escape, COMPANY_NAMES_LOWER),
+                              key=len, reverse=True)) + r")\b"
+)
+
+# ─────────────────────────────────────────────
+# NLP MODEL SETTINGS
+# ─────────────────────────────────────────────
+# Distilled BART: ~2x less compute than facebook/bart-large-cnn, similar ROUGE
+SUMMARIZER_MODEL = os.getenv("SUMMARIZER_MODEL", "sshleifer/distilbart-cnn-12-6")
+SENTIMENT_MODEL  = "nlptown/bert-base-multilingual-uncased-sentiment"
+KEYWORD_MODEL    = "all-MiniLM-L6-v2"      # sentence-transformer behind KeyBERT
+# Articles per batched BART forward pass (override via env)
+NLP_SUMMARY_BATCH_SIZE   = int(os.getenv("NLP_SUMMARY_BATCH_SIZE", "8"))
+# Articles per batched BERT sentiment forward pass
+NLP_SENTIMENT_BATCH_SIZE = int(os.getenv("NLP_SENTIMENT_BATCH_SIZE", "32"))
+# Documents per KeyBERT sentence-embedding forward pass
+NLP_KEYWORD_BATCH_SIZE   = int(os.getenv("NLP_KEYWORD_BATCH_SIZE", "32"))
+# CPU-only hosts: dynamically quantise transformer Linear layers to int8
+# (GPU hosts always load FP16 weights instead). Set to 0 for full FP32.
+NLP_CPU_INT8 = os.getenv("NLP_CPU_INT8", "1") == "1"
+
 # ─────────────────────────────────────────────
 # FILE PATHS  (relative to project root)
 # ─────────────────────────────────────────────
 RAW_NEWS_FILE       = "data/news_raw.json"
 PROCESSED_NEWS_FILE = "data/news_processed.json"
 MARKET_FILE         = "data/market_data.json"
+MARKET_PARQUET_FILE = "data/market_data.parquet"  # typed columnar copy of MARKET_FILE
 ANALYSIS_FILE       = "data/analysis_output.json"
 TREND_HISTORY_FILE  = "data/stock_trend_history.csv"
+RSS_CACHE_FILE      = "data/.rss_cache.json"    # ETag / Last-Modified + entries per feed
+NLP_CACHE_FILE      = "data/.nlp_cache.json"    # model outputs per model-input hash
+NLP_CACHE_TTL       = 7 * 24 * 3600             # seconds before a cached result expires
 
 # ─────────────────────────────────────────────
 # SENTIMENT LABEL  →  NUMERIC SCORE  [-1 … 1]
@@ -122,3 +153,24 @@ IMPACT_WEIGHTS = {
     "movement":  0.35,   # intraday price change confirms or contradicts
     "volume":    0.20,   # high volume = conviction
 }
+
+# ─────────────────────────────────────────────
+# COLUMN DTYPES — the one type table for the Parquet market snapshot
+# and the per-(article, ticker) working frames
+# Prices stay float64 (movement_score divides small differences of them);
+# scores are normalised to ~[-1, 1], so FP32 is plenty — they are widened
+# back to float64 and rounded only when written to JSON.
+# Volume stays int64: mega-cap daily volumes exceed the int32 range.
+# ─────────────────────────────────────────────
+SCHEMA = {
+    "open":           "float64",
+    "high":           "float64",
+    "low":            "float64",
+    "close":          "float64",
+    "volume":         "int64",
+    "news_linked":    "bool",
+    "sentiment_num":  "float32",
+    "movement_score": "float32",
+    "volume_score":   "float32",
+    "impact_score":   "float32",
+}
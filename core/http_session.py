@@ -0,0 +1,30 @@
+# core/http_session.py
+"""
+Shared HTTP session factory for the network-bound agents.
+
+A pooled requests.Session keeps TCP + TLS connections alive between
+calls to the same host, so repeated Alpha Vantage / NewsAPI / RSS
+requests skip the handshake after the first one.
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+def build_session(pool_size: int = 10) -> requests.Session:
+    """Session with keep-alive pooling and retry/backoff on transient errors."""
+    retry = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
@@ -0,0 +1,43 @@
+# core/jsonio.py
+"""
+Shared JSON file I/O for every agent.
+
+Backed by orjson (C encoder/decoder) instead of the pure-Python
+pretty-printer in the stdlib. orjson works on bytes, so files are
+opened in binary mode; output is always UTF-8.
+"""
+
+import mmap
+import os
+
+import orjson
+
+_DUMP_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def load_json(path: str):
+    """
+    Read and parse the JSON document at *path*.
+
+    The file is memory-mapped and its pages handed to orjson directly,
+    so there is no intermediate bytes/str copy of the whole document.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return orjson.loads(b"")            # raises JSONDecodeError
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m, \
+             memoryview(m) as view:
+            return orjson.loads(view)
+
+
+def dump_json(obj, path: str, indent: bool = True) -> None:
+    """
+    Serialise *obj* to *path* (numpy scalars allowed).
+
+    Output is 2-space indented by default; pass indent=False for the
+    compact form on machine-only files, which is smaller and faster to
+    write and to re-read.
+    """
+    option = _DUMP_OPTIONS | orjson.OPT_INDENT_2 if indent else _DUMP_OPTIONS
+    with open(path, "wb") as f:
+        f.write(orjson.dumps(obj, option=option))
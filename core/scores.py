@@ -0,0 +1,84 @@
+# core/scores.py
+"""
+Scoring primitives shared by every agent.
+
+All functions are vectorised: they take NumPy arrays / pandas Series
+(one value per row) and return NumPy arrays. Each formula carries a
+version tag so stored outputs can be traced back to the maths that
+produced them — bump the tag whenever a formula changes.
+"""
+
+import numpy as np
+
+from core.config import IMPACT_WEIGHTS
+
+__all__ = [
+    "FORMULA_VERSIONS",
+    "TREND_LABELS",
+    "impact_v1",
+    "impact_v2",
+    "trend",
+]
+
+FORMULA_VERSIONS = {
+    "impact_v1": "1.0",   # weighted sentiment + movement + volume·sign(sentiment)
+    "impact_v2": "1.0",   # 60 % sentiment + 40 % movement
+    "trend":     "1.0",   # five bands split at ±0.05 / ±0.25
+}
+
+# Trend labels, strongest bullish → strongest bearish (index = trend code)
+TREND_LABELS = np.array([
+    "Strong Bullish",
+    "Moderate Bullish",
+    "Neutral",
+    "Moderate Bearish",
+    "Strong Bearish",
+])
+
+# (sentiment, movement, volume) weights as a vector for the impact dot product
+_IMPACT_V1_WEIGHTS = np.array([
+    IMPACT_WEIGHTS["sentiment"],
+    IMPACT_WEIGHTS["movement"],
+    IMPACT_WEIGHTS["volume"],
+])
+
+
+def impact_v1(sentiment_num, movement, volume_score) -> np.ndarray:
+    """
+    impact = w_sentiment * sentiment
+           + w_movement  * movement
+           + w_volume    * volume_score * sign(sentiment)
+
+    The volume term is multiplied by sign(sentiment) so that high
+    volume amplifies the direction the news points, not just magnitude.
+    Used by Analysis_Agent.
+    """
+    s = np.asarray(sentiment_num, dtype=float)
+    sign = np.where(s >= 0, 1.0, -1.0)
+    terms = np.column_stack((s, np.asarray(movement, dtype=float),
+                             np.asarray(volume_score, dtype=float) * sign))
+    return (terms @ _IMPACT_V1_WEIGHTS).round(4)
+
+
+def impact_v2(sentiment_num, movement) -> np.ndarray:
+    """
+    Weighted impact:
+        sentiment  → 60 %
+        movement   → 40 %
+    Used by ImpactAgent.
+    """
+    s = np.asarray(sentiment_num, dtype=float)
+    m = np.asarray(movement, dtype=float)
+    return (s * 0.6 + m * 0.4).round(4)
+
+
+def trend(scores) -> np.ndarray:
+    """Classify impact scores into TREND_LABELS in one vectorised sweep."""
+    s = np.asarray(scores, dtype=float)
+    # int8 code = 4 − number of thresholds cleared (0 = Strong Bullish)
+    codes = np.full(s.shape, 4, dtype=np.int8)
+    codes -= s >= -0.25
+    codes -= s >= -0.05
+    codes -= s >  0.05
+    codes -= s >  0.25
+    return TREND_LABELS[codes]
@@ -16,7 +16,6 @@ WHY no CrewAI here?
 
 import sys
 import os
-import json
 import traceback
 from datetime import datetime
 
@@ -28,6 +27,19 @@ from agents.nlp_agent      import NLPAgent
 from agents.market_agent   import MarketAgent
 from agents.analysis_agent import AnalysisAgent
 from core.config           import RAW_NEWS_FILE
+from core.jsonio           import load_json
+
+
+# ── Agent instances — built on first use, reused by every later run ──
+# NLPAgent holds several GB of models; the scheduler calls run_pipeline()
+# every tick, so rebuilding agents per run would reload them each time.
+_AGENTS = {}
+
+
+def _agent(cls):
+    if cls not in _AGENTS:
+        _AGENTS[cls] = cls()
+    return _AGENTS[cls]
 
 
 # ═══════════════════════════════════════════════════════════════════════
@@ -37,7 +49,7 @@ from core.config           import RAW_NEWS_FILE
 def step_news() -> bool:
     """STEP 1 — Scrape US financial news → data/news_raw.json"""
     try:
-        articles = NewsAgent().run()
+        articles = _agent(NewsAgent).run()
         print(f"  ✓ News_Agent produced {len(articles)} articles.\n")
         return True
     except Exception as e:
@@ -47,16 +59,15 @@ def step_news() -> bool:
 
 
 def step_nlp() -> bool:
-    """STEP 2 — spaCy + BART + BERT + KeyBERT → data/news_processed.json"""
+    """STEP 2 — BART + BERT + KeyBERT → data/news_processed.json"""
     try:
-        with open(RAW_NEWS_FILE, "r", encoding="utf-8") as f:
-            raw_news = json.load(f)
+        raw_news = load_json(RAW_NEWS_FILE)
 
         if not raw_news:
             print("  ⚠️  news_raw.json is empty — nothing to process.")
             return False
 
-        processed = NLPAgent().process(raw_news)
+        processed = _agent(NLPAgent).process(raw_news)
         print(f"  ✓ NLP_Agent enriched {len(processed)} articles.\n")
         return True
     except Exception as e:
@@ -68,7 +79,7 @@ def step_nlp() -> bool:
 def step_market() -> bool:
     """STEP 3 — Fetch intraday prices → data/market_data.json + trend CSV"""
     try:
-        market = MarketAgent().run()
+        market = _agent(MarketAgent).run()
         print(f"  ✓ Market_Agent fetched {len(market)} tickers.\n")
         return True
     except Exception as e:
@@ -80,7 +91,7 @@ def step_market() -> bool:
 def step_analysis() -> bool:
     """STEP 4 — Join news + market, score, rank → data/analysis_output.json"""
     try:
-        output = AnalysisAgent().run()
+        output = _agent(AnalysisAgent).run()
         bullish = len(output.get("top_10_bullish", []))
         bearish = len(output.get("top_10_bearish", []))
         print(f"  ✓ Analysis_Agent: {bullish} bullish, {bearish} bearish.\n")
@@ -4,21 +4,89 @@ Streamlit dashboard — run from project root:
     streamlit run dashboard/app.py
 """
 
+import os
+
 import streamlit as st
-import json
+import orjson
 import pandas as pd
 import plotly.express as px
 from streamlit_autorefresh import st_autorefresh
 
 # ─── helpers ──────────────────────────────────────────────────────────
-def load_json(path: str):
+# Loaders are memoised on (path, mtime): autorefresh ticks and widget
+# reruns reuse the parsed data until the pipeline rewrites the file.
+def _mtime(path: str):
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _load_json(path: str, mtime):
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
     except Exception:
         return {}
 
 
+def load_json(path: str):
+    return _load_json(path, _mtime(path))
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _records_frame(path: str, key: str, mtime) -> pd.DataFrame:
+    data = _load_json(path, mtime)
+    return pd.DataFrame(data.get(key, []) if isinstance(data, dict) else [])
+
+
+def records_frame(path: str, key: str) -> pd.DataFrame:
+    """DataFrame of the record list stored under *key* in a JSON file."""
+    return _records_frame(path, key, _mtime(path))
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _market_table(path: str, mtime) -> pd.DataFrame:
+    market = _load_json(path, mtime)
+    if not market or not isinstance(market, dict):
+        return pd.DataFrame()
+
+    # one row per ticker; every column computed / formatted as a whole
+    df = (pd.DataFrame.from_dict(market, orient="index")
+            .reindex(columns=["open", "high", "low", "close",
+                              "volume", "news_linked"]))
+    o = pd.to_numeric(df["open"],  errors="coerce").fillna(0)
+    c = pd.to_numeric(df["close"], errors="coerce").fillna(0)
+    chg = ((c - o) / o.where(o != 0) * 100).round(2).fillna(0.0)
+
+    return pd.DataFrame({
+        "Symbol":  df.index,
+        "Open":    df["open"].fillna("—"),
+        "High":    df["high"].fillna("—"),
+        "Low":     df["low"].fillna("—"),
+        "Close":   df["close"].fillna("—"),
+        "Chg %":   chg.map("{:+.2f}%".format),
+        "Volume":  df["volume"].fillna(0).astype("int64").map("{:,}".format),
+        "News?":   df["news_linked"].fillna(False).astype(bool)
+                                    .map({True: "✅", False: ""}),
+    }).reset_index(drop=True)
+
+
+def market_table(path: str) -> pd.DataFrame:
+    """Formatted Live Market Snapshot table for the market JSON file."""
+    return _market_table(path, _mtime(path))
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _read_csv(path: str, mtime) -> pd.DataFrame:
+    return pd.read_csv(path)
+
+
+def read_csv(path: str) -> pd.DataFrame:
+    return _read_csv(path, _mtime(path))
+
+
 # ═══════════════════════════════════════════════════════════════════════
 # PAGE CONFIG
 # ═══════════════════════════════════════════════════════════════════════
@@ -57,7 +125,8 @@ st_autorefresh(interval=30_000, key="refresh")
 # ═══════════════════════════════════════════════════════════════════════
 analysis = load_json("data/analysis_output.json")
 news     = load_json("data/news_processed.json")
-market   = load_json("data/market_data.json")
+df_market = market_table("data/market_data.json")
+df_full  = records_frame("data/analysis_output.json", "full_list")
 
 # news can be a list (normal) or empty dict (file missing)
 if isinstance(news, dict):
@@ -66,14 +135,12 @@ if isinstance(news, dict):
 # ═══════════════════════════════════════════════════════════════════════
 # ALERT BAR
 # ═══════════════════════════════════════════════════════════════════════
-def render_alerts(data: dict):
+def render_alerts(df: pd.DataFrame):
     st.subheader("🔔 Real-Time Alerts")
-    full = data.get("full_list", [])
-    if not full:
+    if df.empty:
         st.info("No impact data yet — run the pipeline first.")
         return
 
-    df = pd.DataFrame(full)
     strong_bull = df[df["impact_score"] >  0.3]
     strong_bear = df[df["impact_score"] < -0.3]
 
@@ -127,7 +194,7 @@ with col_news:
 
 # ─── RIGHT: Alerts + top lists ────────────────────────────────────────
 with col_right:
-    render_alerts(analysis)
+    render_alerts(df_full)
 
     # Top-10 Bullish
     st.subheader("🟢 Top 10 Bullish")
@@ -155,21 +222,8 @@ with col_right:
 # LIVE MARKET SNAPSHOT
 # ═══════════════════════════════════════════════════════════════════════
 st.subheader("📈 Live Market Snapshot")
-if market and isinstance(market, dict):
-    rows = []
-    for sym, e in market.items():
-        chg = round(((e.get("close",0) - e.get("open",0)) / e.get("open",1)) * 100, 2) if e.get("open") else 0
-        rows.append({
-            "Symbol":  sym,
-            "Open":    e.get("open",  "—"),
-            "High":    e.get("high",  "—"),
-            "Low":     e.get("low",   "—"),
-            "Close":   e.get("close", "—"),
-            "Chg %":   f"{chg:+.2f}%",
-            "Volume":  f"{e.get('volume',0):,}",
-            "News?":   "✅" if e.get("news_linked") else "",
-        })
-    st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+if not df_market.empty:
+    st.dataframe(df_market, use_container_width=True, hide_index=True)
 else:
     st.info("No market data yet.")
 
@@ -177,9 +231,7 @@ else:
 # FULL IMPACT TABLE
 # ═══════════════════════════════════════════════════════════════════════
 st.subheader("📊 Full Impact Table")
-full = analysis.get("full_list", [])
-if full:
-    df_full = pd.DataFrame(full)
+if not df_full.empty:
     cols = [c for c in ["symbol","impact_score","trend","sentiment_label",
                         "movement_score","volume","news_headline"]
             if c in df_full.columns]
@@ -196,7 +248,7 @@ else:
 # ═══════════════════════════════════════════════════════════════════════
 st.subheader("📉 8-Day Stock Trend")
 try:
-    df_trend = pd.read_csv("data/stock_trend_history.csv")
+    df_trend = read_csv("data/stock_trend_history.csv")
     if not df_trend.empty:
         fig = px.line(
             df_trend, x="date", y="trend_score", color="symbol",
@@ -5,26 +5,47 @@ Execute from the project root:
     python scheduler.py
 """
 
-import sys, os, time
+import sys, os
 from datetime import datetime
 
+from apscheduler.schedulers.blocking import BlockingScheduler
+
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from crew.crew_pipeline import run_pipeline
 
+INTERVAL_MINUTES = 10
+
+
+def run_once():
+    try:
+        run_pipeline()
+    except Exception as e:
+        print(f"❌ Pipeline crashed: {e}")
+
+    print(f"\n⏳  Waiting for next {INTERVAL_MINUTES}-min slot …  "
+          f"({datetime.now().strftime('%H:%M:%S')})\n")
+
 
 def main():
     print("⏰  Scheduler started.")
     print(f"    CWD : {os.getcwd()}")
     print(f"    First run : {datetime.now().strftime('%H:%M:%S')}\n")
 
-    while True:
-        try:
-            run_pipeline()
-        except Exception as e:
-            print(f"❌ Pipeline crashed: {e}")
-
-        print(f"\n⏳  Next run in 10 min …  ({datetime.now().strftime('%H:%M:%S')})\n")
-        time.sleep(600)
+    # Fixed wall-clock cadence (no drift from run time). A run that overruns
+    # its slot is never started twice; missed slots collapse into one run.
+    sched = BlockingScheduler()
+    sched.add_job(
+        run_once,
+        "interval",
+        minutes=INTERVAL_MINUTES,
+        next_run_time=datetime.now(),
+        max_instances=1,
+        coalesce=True,
+    )
+    try:
+        sched.start()
+    except (KeyboardInterrupt, SystemExit):
+        print("👋  Scheduler stopped.")
 
 
 if __name__ == "__main__":